@@ -2,7 +2,13 @@
 Database package for WWTP Equipment Tool
 """
 
-from .schema import create_schema, reset_database, get_db_path
+from .schema import (
+    SCHEMA_VERSION,
+    create_schema,
+    reset_database,
+    get_db_path,
+    get_schema_version
+)
 from .models import (
     ProjectManager,
     EquipmentManager,
@@ -12,9 +18,11 @@ from .models import (
 )
 
 __all__ = [
+    'SCHEMA_VERSION',
     'create_schema',
     'reset_database',
     'get_db_path',
+    'get_schema_version',
     'ProjectManager',
     'EquipmentManager',
     'ProjectEquipmentManager',
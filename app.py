@@ -3,13 +3,18 @@ WWTP Equipment Management Tool
 Main Streamlit Application
 """
 
+import sqlite3
+import threading
 import streamlit as st
 import pandas as pd
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 # Import database managers
 from database import (
+    SCHEMA_VERSION,
     create_schema,
+    get_schema_version,
     ProjectManager,
     EquipmentManager,
     ProjectEquipmentManager,
@@ -17,6 +22,70 @@ from database import (
     DocumentManager
 )
 
+# Minimum number of characters before the equipment search runs
+MIN_SEARCH_LENGTH = 2
+
+# Rows per page in the Equipment Master list
+EQUIPMENT_PAGE_SIZE = 200
+
+# Most row errors listed after a failed CSV import
+MAX_IMPORT_ERRORS = 10
+
+# Largest quantity accepted for one project equipment item
+MAX_EQUIPMENT_QUANTITY = 9999
+
+# Selectbox choices
+EQUIPMENT_TYPES = ("Pump", "Mixer", "Blower", "Screen", "Clarifier", "Filter", "Other")
+PROJECT_PHASES = ("Design", "Bid", "Construction", "Closeout")
+EQUIPMENT_STATUSES = ("new", "existing", "replace", "remove", "TBD")
+
+# Columns read for the Tab 3 equipment selectbox and CSV import lookups
+EQUIPMENT_OPTION_COLUMNS = ['equipment_id', 'manufacturer', 'model', 'equipment_type']
+
+# Uploaded equipment files (resolved once per script run; tab fragment reruns reuse it)
+FILE_STORAGE_PATH = Path("data/files").absolute()
+
+# Table columns and column settings, defined once per script run rather than
+# inside the tabs, so tab fragment reruns reuse them
+EQUIPMENT_DISPLAY_COLS = ('equipment_id', 'manufacturer', 'model', 'equipment_type',
+                          'power_hp', 'flow_gpm', 'head_ft', 'voltage')
+
+EQUIPMENT_COLUMN_CONFIG = {
+    "equipment_id": "ID",
+    "manufacturer": "Manufacturer",
+    "model": "Model",
+    "equipment_type": "Type",
+    "power_hp": st.column_config.NumberColumn("HP", format="%.1f"),
+    "flow_gpm": st.column_config.NumberColumn("Flow (GPM)", format="%.0f"),
+    "head_ft": st.column_config.NumberColumn("Head (ft)", format="%.1f"),
+    "voltage": "Voltage",
+    "document_count": st.column_config.NumberColumn("Docs", format="%d"),
+    "quote_count": st.column_config.NumberColumn("Quotes", format="%d")
+}
+
+QUOTE_DISPLAY_COLS = ['vendor', 'price', 'lead_time_weeks', 'quote_date']
+
+QUOTE_COLUMN_CONFIG = {
+    "vendor": "Vendor",
+    "price": st.column_config.NumberColumn("Price", format="$%.2f"),
+    "lead_time_weeks": st.column_config.NumberColumn("Lead Time (wk)", format="%d"),
+    "quote_date": "Quote Date"
+}
+
+PROJECT_EQUIPMENT_DISPLAY_COLS = ['pid_tag', 'manufacturer', 'model', 'equipment_type',
+                                  'status', 'quantity', 'location', 'price']
+
+PROJECT_EQUIPMENT_COLUMN_CONFIG = {
+    "pid_tag": "P&ID Tag",
+    "manufacturer": "Manufacturer",
+    "model": "Model",
+    "equipment_type": "Type",
+    "status": "Status",
+    "quantity": st.column_config.NumberColumn("Qty", format="%d"),
+    "location": "Location",
+    "price": st.column_config.NumberColumn("Unit Price", format="$%.2f")
+}
+
 # Page configuration
 st.set_page_config(
     page_title="WWTP Equipment Tool",
@@ -25,11 +94,29 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize database on first run
-@st.cache_resource
+def _database_is_healthy(managers) -> bool:
+    """Check the cached managers can still reach a current-schema database"""
+    manager = managers['project']
+    try:
+        healthy = (manager.db_path.exists() and
+                   manager.execute_scalar("PRAGMA user_version") == SCHEMA_VERSION)
+    except sqlite3.Error:
+        healthy = False
+    
+    if not healthy:
+        for m in managers.values():
+            m.close()
+    return healthy
+
+
+# Initialize database on first run (re-initialized if the cached one goes stale)
+@st.cache_resource(validate=_database_is_healthy)
 def init_database():
     """Initialize database and return managers"""
-    create_schema()
+    if get_schema_version() != SCHEMA_VERSION:
+        create_schema()
+    # Results cached against a previous connection may describe another database
+    st.cache_data.clear()
     return {
         'project': ProjectManager(),
         'equipment': EquipmentManager(),
@@ -45,6 +132,132 @@ db = init_database()
 if 'active_project_id' not in st.session_state:
     st.session_state.active_project_id = None
 
+
+# ============================================================================
+# CACHED QUERIES
+# ============================================================================
+# Read-only fetches are cached per data version so repeated reruns reuse the
+# previous result instead of querying SQLite again. Bump the version after
+# every write to invalidate them. The cached results are shared by every
+# session, so the version is too.
+
+class _DataVersion:
+    """Process-wide counter of writes made through the app"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+
+
+@st.cache_resource
+def _data_version() -> _DataVersion:
+    """Get the data version shared by all sessions"""
+    return _DataVersion()
+
+
+def current_data_version() -> int:
+    """Get the version cached queries are keyed on"""
+    return _data_version().value
+
+
+def bump_data_version():
+    """Invalidate cached queries after a write"""
+    _data_version().bump()
+
+
+@st.cache_data(ttl=300)
+def _cached_all_projects(version: int) -> List[Dict]:
+    """Get all projects (cached per data version)"""
+    return db['project'].get_all_projects()
+
+
+@st.cache_data(ttl=300)
+def _cached_equipment_df(version: int, columns: tuple, offset: int = 0) -> pd.DataFrame:
+    """Get one page of equipment as a DataFrame of the given columns (cached per data version)"""
+    return db['equipment'].get_all_equipment_df(
+        columns=list(columns), limit=EQUIPMENT_PAGE_SIZE, offset=offset
+    )
+
+
+@st.cache_data(ttl=60)
+def _cached_search_equipment(version: int, search_term: str, prefix: bool = False) -> List[Dict]:
+    """Search equipment (cached per data version and search term)"""
+    return db['equipment'].search_equipment(search_term, prefix=prefix)
+
+
+@st.cache_data(ttl=300)
+def _cached_project_equipment_df(version: int, project_id: int) -> pd.DataFrame:
+    """Get a project's equipment with details as a DataFrame (cached per data version)"""
+    return db['project_equipment'].get_project_equipment_df(project_id)
+
+
+@st.cache_data(ttl=300)
+def _cached_quotes_by_equipment(version: int) -> Dict[int, List[Dict]]:
+    """Get all quotes keyed by equipment ID (cached per data version)"""
+    return db['quote'].get_quotes_by_equipment()
+
+
+@st.cache_data(ttl=300, max_entries=1024)
+def _cached_equipment(version: int, equipment_id: int) -> Dict:
+    """Get one equipment record (cached per data version, bounded to recent IDs)"""
+    return db['equipment'].get_equipment(equipment_id)
+
+
+@st.cache_data(ttl=300)
+def _cached_equipment_documents(version: int, equipment_id: int) -> List[Dict]:
+    """Get all documents for equipment (cached per data version)"""
+    return db['document'].get_equipment_documents(equipment_id)
+
+
+@st.cache_data(ttl=300)
+def _cached_projects_by_id(version: int) -> Dict[int, Dict]:
+    """Get projects keyed by project ID (cached per data version)"""
+    return {p['project_id']: p for p in _cached_all_projects(version)}
+
+
+@st.cache_data(ttl=300)
+def _cached_project_options(version: int) -> Dict[int, str]:
+    """Get project selectbox labels keyed by project ID (cached per data version)"""
+    return {p['project_id']: f"{p['name']} ({p['job_number'] or 'No Job #'})"
+            for p in _cached_all_projects(version)}
+
+
+@st.cache_data(ttl=300)
+def _cached_equipment_options(version: int) -> Dict[int, str]:
+    """Get equipment selectbox labels keyed by equipment ID (cached per data version)"""
+    return {e['equipment_id']: f"{e['manufacturer']} {e['model']} ({e['equipment_type']})"
+            for e in db['equipment'].iter_all_equipment(columns=EQUIPMENT_OPTION_COLUMNS)}
+
+
+@st.cache_data(ttl=300)
+def _cached_equipment_ids(version: int) -> Dict[Tuple[str, str], int]:
+    """Get equipment IDs keyed by (manufacturer, model) for CSV imports (cached per data version)"""
+    return {(e['manufacturer'], e['model']): e['equipment_id']
+            for e in db['equipment'].iter_all_equipment(columns=EQUIPMENT_OPTION_COLUMNS)}
+
+
+@st.cache_data(ttl=300)
+def _cached_database_stats(version: int) -> Dict[str, int]:
+    """Get table row counts (cached per data version)"""
+    return db['project'].get_database_stats()
+
+
+@st.cache_data(ttl=300)
+def _cached_document_quote_counts(version: int) -> Dict[int, tuple]:
+    """Get (documents, quotes) counts keyed by equipment ID (cached per data version)"""
+    return db['equipment'].get_document_quote_counts()
+
+
+@st.cache_data(ttl=300)
+def _cached_equipment_counts(version: int) -> Dict[int, int]:
+    """Get equipment counts keyed by project ID (cached per data version)"""
+    return db['project_equipment'].get_counts_by_project()
+
+
 # ============================================================================
 # SIDEBAR - PROJECT SELECTOR
 # ============================================================================
@@ -53,19 +266,21 @@ with st.sidebar:
     st.title("🏭 WWTP Equipment Tool")
     st.markdown("---")
     
+    projects = _cached_all_projects(current_data_version())
+    project_options = _cached_project_options(current_data_version())
+    projects_by_id = _cached_projects_by_id(current_data_version())
+    equipment_counts = _cached_equipment_counts(current_data_version())
+    stats = _cached_database_stats(current_data_version())
+    
     # Project selector
     st.subheader("Active Project")
-    projects = db['project'].get_all_projects()
     
     if projects:
-        project_options = {p['project_id']: f"{p['name']} ({p['job_number'] or 'No Job #'})" 
-                          for p in projects}
-        
         selected_project_id = st.selectbox(
             "Select Project",
-            options=list(project_options.keys()),
-            format_func=lambda x: project_options[x],
-            index=list(project_options.keys()).index(st.session_state.active_project_id) 
+            options=project_options,
+            format_func=project_options.get,
+            index=list(project_options).index(st.session_state.active_project_id) 
                   if st.session_state.active_project_id in project_options else 0
         )
         
@@ -75,30 +290,28 @@ with st.sidebar:
         
         # Display active project info
         if st.session_state.active_project_id:
-            active_project = db['project'].get_project(st.session_state.active_project_id)
+            active_project = projects_by_id[st.session_state.active_project_id]
             st.success(f"**{active_project['name']}**")
             if active_project['client']:
                 st.caption(f"Client: {active_project['client']}")
             if active_project['phase']:
                 st.caption(f"Phase: {active_project['phase']}")
     else:
+        st.session_state.active_project_id = None
         st.info("No projects yet. Create one in the Projects tab.")
     
     st.markdown("---")
     
     # Quick stats
     if st.session_state.active_project_id:
-        equipment_count = len(db['project_equipment'].get_project_equipment(
-            st.session_state.active_project_id
-        ))
+        equipment_count = equipment_counts.get(st.session_state.active_project_id, 0)
         st.metric("Equipment Items", equipment_count)
     
     # Database info
     st.markdown("---")
     st.caption("**Database Status**")
-    total_equipment = len(db['equipment'].get_all_equipment())
-    st.caption(f"📦 Equipment Master: {total_equipment} items")
-    st.caption(f"🏗️ Projects: {len(projects)} active")
+    st.caption(f"📦 Equipment Master: {stats['equipment_master']} items")
+    st.caption(f"🏗️ Projects: {stats['projects']} active")
 
 # ============================================================================
 # MAIN TABS
@@ -117,7 +330,9 @@ tabs = st.tabs([
 # TAB 1: EQUIPMENT MASTER
 # ============================================================================
 
-with tabs[0]:
+@st.fragment
+def render_equipment_master_tab():
+    """Equipment Master tab (widget changes rerun only this tab)"""
     st.header("📦 Equipment Master Catalog")
     st.markdown("Manage your equipment database with specifications, documents, and pricing.")
     
@@ -127,39 +342,117 @@ with tabs[0]:
         st.subheader("Equipment List")
         
         # Search and filter
-        search_term = st.text_input("🔍 Search equipment", placeholder="Enter manufacturer, model, or type...")
+        search_term = st.text_input(
+            "🔍 Search equipment",
+            placeholder="Enter manufacturer, model, or type...",
+            key="equipment_search"
+        ).strip()
+        search_prefix = st.checkbox(
+            "Match start of manufacturer, model, or type only",
+            key="equipment_search_prefix"
+        )
         
-        if search_term:
-            equipment_list = db['equipment'].search_equipment(search_term)
+        # Ignore one-character terms; they match nearly everything
+        if len(search_term) >= MIN_SEARCH_LENGTH:
+            equipment_list = _cached_search_equipment(current_data_version(), search_term, search_prefix)
+            display_df = None
+            if equipment_list:
+                df = pd.DataFrame(equipment_list)
+                display_df = df[[col for col in EQUIPMENT_DISPLAY_COLS if col in df.columns]]
+                display_df = display_df.astype({col: t for col, t in EquipmentManager.COLUMN_DTYPES.items()
+                                                if col in display_df.columns})
+                summary = f"Showing {len(display_df)} equipment items"
         else:
-            equipment_list = db['equipment'].get_all_equipment()
-        
-        if equipment_list:
-            # Convert to DataFrame for display
-            df = pd.DataFrame(equipment_list)
+            if search_term:
+                st.caption(f"Enter at least {MIN_SEARCH_LENGTH} characters to search")
+            
+            # Only the current page is read from SQLite and sent to the browser
+            total_equipment = _cached_database_stats(current_data_version())['equipment_master']
+            page_count = max(1, (total_equipment + EQUIPMENT_PAGE_SIZE - 1) // EQUIPMENT_PAGE_SIZE)
+            page = 1
+            if page_count > 1:
+                if st.session_state.get('equipment_page', 1) > page_count:
+                    st.session_state.equipment_page = page_count
+                page = st.number_input("Page", min_value=1, max_value=page_count, step=1,
+                                       key="equipment_page")
+            offset = (page - 1) * EQUIPMENT_PAGE_SIZE
             
-            # Select key columns for display
-            display_cols = ['equipment_id', 'manufacturer', 'model', 'equipment_type', 
-                          'power_hp', 'flow_gpm', 'head_ft', 'voltage']
-            display_df = df[[col for col in display_cols if col in df.columns]]
+            # Only the displayed columns are read, straight into typed columns
+            display_df = None
+            if total_equipment:
+                display_df = _cached_equipment_df(current_data_version(), EQUIPMENT_DISPLAY_COLS, offset)
+                if page_count > 1:
+                    summary = (f"Showing {offset + 1}–{offset + len(display_df)} of "
+                               f"{total_equipment} equipment items")
+                else:
+                    summary = f"Showing {len(display_df)} equipment items"
+        
+        # display_df is None when there is nothing to show (no DataFrame is built)
+        if display_df is not None:
+            # Attach document/quote counts from one grouped query
+            doc_quote_counts = _cached_document_quote_counts(current_data_version())
+            counts = display_df['equipment_id'].map(lambda eid: doc_quote_counts.get(eid, (0, 0)))
+            display_df = display_df.assign(
+                document_count=counts.str[0],
+                quote_count=counts.str[1]
+            )
             
-            st.dataframe(
+            selection = st.dataframe(
                 display_df,
                 use_container_width=True,
                 hide_index=True,
-                column_config={
-                    "equipment_id": "ID",
-                    "manufacturer": "Manufacturer",
-                    "model": "Model",
-                    "equipment_type": "Type",
-                    "power_hp": st.column_config.NumberColumn("HP", format="%.1f"),
-                    "flow_gpm": st.column_config.NumberColumn("Flow (GPM)", format="%.0f"),
-                    "head_ft": st.column_config.NumberColumn("Head (ft)", format="%.1f"),
-                    "voltage": "Voltage"
-                }
+                on_select="rerun",
+                selection_mode="single-row",
+                key="equipment_table",
+                column_config=EQUIPMENT_COLUMN_CONFIG
             )
             
-            st.caption(f"Showing {len(equipment_list)} equipment items")
+            st.caption(f"{summary} · select a row for details")
+            
+            # Details, quotes, and documents are only fetched for the selected row
+            selected_rows = selection.selection.rows
+            if selected_rows and selected_rows[0] < len(display_df):
+                selected_id = int(display_df.iloc[selected_rows[0]]['equipment_id'])
+                equipment = _cached_equipment(current_data_version(), selected_id)
+                quotes = _cached_quotes_by_equipment(current_data_version()).get(selected_id, [])
+                documents = _cached_equipment_documents(current_data_version(), selected_id)
+                
+                if equipment:
+                    st.markdown(f"#### {equipment['manufacturer']} {equipment['model']}")
+                    
+                    col_a, col_b, col_c = st.columns(3)
+                    with col_a:
+                        st.caption("**Subtype**")
+                        st.write(equipment['equipment_subtype'] or "—")
+                        st.caption("**RPM**")
+                        st.write(equipment['rpm'] or "—")
+                    with col_b:
+                        st.caption("**Material**")
+                        st.write(equipment['material'] or "—")
+                        st.caption("**Connection Size**")
+                        st.write(equipment['connection_size'] or "—")
+                    with col_c:
+                        st.caption("**Weight (lbs)**")
+                        st.write(equipment['weight_lbs'] or "—")
+                        st.caption("**Added**")
+                        st.write(equipment['created_date'][:10] if equipment['created_date'] else "—")
+                    
+                    if equipment['notes']:
+                        st.caption("**Notes**")
+                        st.write(equipment['notes'])
+                    
+                    st.caption(f"**Quotes** ({len(quotes)})")
+                    if quotes:
+                        st.dataframe(
+                            pd.DataFrame(quotes)[QUOTE_DISPLAY_COLS],
+                            use_container_width=True,
+                            hide_index=True,
+                            column_config=QUOTE_COLUMN_CONFIG
+                        )
+                    
+                    st.caption(f"**Documents** ({len(documents)})")
+                    for document in documents:
+                        st.write(f"📄 {document['file_name']} ({document['document_type']})")
         else:
             st.info("No equipment found. Add equipment using the form on the right.")
     
@@ -172,7 +465,7 @@ with tabs[0]:
             
             equipment_type = st.selectbox(
                 "Equipment Type*",
-                options=["Pump", "Mixer", "Blower", "Screen", "Clarifier", "Filter", "Other"]
+                options=EQUIPMENT_TYPES
             )
             
             equipment_subtype = st.text_input("Subtype", placeholder="e.g., Submersible")
@@ -212,15 +505,22 @@ with tabs[0]:
                             notes=notes or None
                         )
                         st.success(f"✓ Equipment added (ID: {equipment_id})")
+                        bump_data_version()
                         st.rerun()
                     except Exception as e:
                         st.error(f"Error adding equipment: {str(e)}")
 
+
+with tabs[0]:
+    render_equipment_master_tab()
+
 # ============================================================================
 # TAB 2: PROJECTS
 # ============================================================================
 
-with tabs[1]:
+@st.fragment
+def render_projects_tab():
+    """Projects tab (widget changes rerun only this tab)"""
     st.header("🏗️ Project Management")
     
     col1, col2 = st.columns([2, 1])
@@ -228,39 +528,59 @@ with tabs[1]:
     with col1:
         st.subheader("Projects")
         
-        projects = db['project'].get_all_projects()
+        projects = _cached_all_projects(current_data_version())
         
         if projects:
+            equipment_counts = _cached_equipment_counts(current_data_version())
+            
             for project in projects:
-                with st.expander(f"**{project['name']}** ({project['job_number'] or 'No Job #'})", 
-                               expanded=(project['project_id'] == st.session_state.active_project_id)):
-                    
-                    col_a, col_b, col_c = st.columns(3)
-                    
-                    with col_a:
-                        st.caption("**Client**")
-                        st.write(project['client'] or "—")
-                    
-                    with col_b:
-                        st.caption("**Phase**")
-                        st.write(project['phase'] or "—")
-                    
-                    with col_c:
-                        st.caption("**Created**")
-                        st.write(project['created_date'][:10] if project['created_date'] else "—")
+                project_id = project['project_id']
+                
+                # Only the summary line is sent for collapsed projects; the body
+                # is rendered when toggled open (the active project starts open)
+                details_key = f"show_project_{project_id}"
+                show_details = st.session_state.get(
+                    details_key, project_id == st.session_state.active_project_id
+                )
+                
+                with st.container(border=True):
+                    col_title, col_toggle = st.columns([4, 1])
                     
-                    if project['notes']:
-                        st.caption("**Notes**")
-                        st.write(project['notes'])
+                    with col_title:
+                        st.markdown(f"**{project['name']}** ({project['job_number'] or 'No Job #'})")
                     
-                    # Equipment count
-                    eq_count = len(db['project_equipment'].get_project_equipment(project['project_id']))
-                    st.info(f"📋 {eq_count} equipment items")
+                    with col_toggle:
+                        if st.button("Details", key=f"details_{project_id}"):
+                            show_details = not show_details
+                            st.session_state[details_key] = show_details
                     
-                    # Actions
-                    if st.button(f"Set as Active Project", key=f"activate_{project['project_id']}"):
-                        st.session_state.active_project_id = project['project_id']
-                        st.rerun()
+                    if show_details:
+                        col_a, col_b, col_c = st.columns(3)
+                        
+                        with col_a:
+                            st.caption("**Client**")
+                            st.write(project['client'] or "—")
+                        
+                        with col_b:
+                            st.caption("**Phase**")
+                            st.write(project['phase'] or "—")
+                        
+                        with col_c:
+                            st.caption("**Created**")
+                            st.write(project['created_date'][:10] if project['created_date'] else "—")
+                        
+                        if project['notes']:
+                            st.caption("**Notes**")
+                            st.write(project['notes'])
+                        
+                        # Equipment count
+                        eq_count = equipment_counts.get(project_id, 0)
+                        st.info(f"📋 {eq_count} equipment items")
+                        
+                        # Actions
+                        if st.button(f"Set as Active Project", key=f"activate_{project_id}"):
+                            st.session_state.active_project_id = project_id
+                            st.rerun()
         else:
             st.info("No projects yet. Create your first project using the form on the right.")
     
@@ -271,7 +591,7 @@ with tabs[1]:
             name = st.text_input("Project Name*", placeholder="e.g., Rio Del Oro WWTP Upgrade")
             client = st.text_input("Client", placeholder="e.g., City of Sacramento")
             job_number = st.text_input("Job Number", placeholder="e.g., 2025-001")
-            phase = st.selectbox("Phase", options=["Design", "Bid", "Construction", "Closeout"])
+            phase = st.selectbox("Phase", options=PROJECT_PHASES)
             notes = st.text_area("Notes", placeholder="Project description or special requirements...")
             
             submit = st.form_submit_button("➕ Create Project", use_container_width=True)
@@ -290,26 +610,88 @@ with tabs[1]:
                         )
                         st.success(f"✓ Project created (ID: {project_id})")
                         st.session_state.active_project_id = project_id
+                        bump_data_version()
                         st.rerun()
                     except Exception as e:
                         st.error(f"Error creating project: {str(e)}")
 
+
+with tabs[1]:
+    render_projects_tab()
+
 # ============================================================================
 # TAB 3: EQUIPMENT LIST BUILDER
 # ============================================================================
 
-with tabs[2]:
+def _read_project_equipment_csv(csv_file, equipment_ids: Dict[Tuple[str, str], int]
+                                ) -> Tuple[List[Dict], List[str]]:
+    """Read a project equipment CSV and validate each row like the Add Equipment form
+    
+    Returns the rows to insert and the problems found; rows are numbered as
+    lines in the file, after the header. Nothing should be imported if any
+    problem is returned.
+    """
+    try:
+        # Read everything as text so values are checked as typed in the file
+        import_df = pd.read_csv(csv_file, dtype=str)
+    except (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError) as e:
+        return [], [f"Could not read the CSV file: {str(e)}"]
+    
+    missing = [c for c in ('manufacturer', 'model', 'pid_tag') if c not in import_df.columns]
+    if missing:
+        return [], [f"Missing columns: {', '.join(missing)}"]
+    
+    # Blank cells come back as NaN; store them as NULL
+    import_df = import_df.astype(object).where(import_df.notna(), None)
+    
+    rows = []
+    errors = []
+    tag_lines = {}
+    for line, record in enumerate(import_df.to_dict('records'), start=2):
+        key = (record['manufacturer'], record['model'])
+        pid_tag = (record['pid_tag'] or '').strip()
+        first_line = tag_lines.setdefault(pid_tag, line)
+        status = record.get('status') or 'new'
+        quantity = (record.get('quantity') or '1').strip()
+        
+        if key not in equipment_ids:
+            errors.append(f"Row {line}: {key[0]} {key[1]} is not in the master catalog")
+        elif not pid_tag:
+            errors.append(f"Row {line}: P&ID tag is required")
+        elif first_line != line:
+            errors.append(f"Row {line}: P&ID tag {pid_tag} is already used on row {first_line}")
+        elif status not in EQUIPMENT_STATUSES:
+            errors.append(f"Row {line}: status must be one of {', '.join(EQUIPMENT_STATUSES)}")
+        elif not quantity.isdecimal() or not 1 <= int(quantity) <= MAX_EQUIPMENT_QUANTITY:
+            errors.append(f"Row {line}: quantity must be a whole number from 1 to {MAX_EQUIPMENT_QUANTITY}")
+        else:
+            rows.append({
+                'equipment_id': equipment_ids[key],
+                'pid_tag': pid_tag,
+                'status': status,
+                'quantity': int(quantity),
+                'location': record.get('location'),
+                'notes': record.get('notes')
+            })
+    return rows, errors
+
+
+@st.fragment
+def render_equipment_list_tab():
+    """Equipment List Builder tab (widget changes rerun only this tab)"""
     st.header("📋 Equipment List Builder")
     
     if not st.session_state.active_project_id:
         st.warning("⚠️ Please select or create a project first (see Projects tab)")
     else:
-        active_project = db['project'].get_project(st.session_state.active_project_id)
+        active_project = _cached_projects_by_id(current_data_version())[
+            st.session_state.active_project_id
+        ]
         st.info(f"Building equipment list for: **{active_project['name']}**")
         
         # Get current project equipment
-        project_equipment = db['project_equipment'].get_project_equipment(
-            st.session_state.active_project_id
+        project_equipment_df = _cached_project_equipment_df(
+            current_data_version(), st.session_state.active_project_id
         )
         
         col1, col2 = st.columns([3, 1])
@@ -317,31 +699,17 @@ with tabs[2]:
         with col1:
             st.subheader("Project Equipment")
             
-            if project_equipment:
-                df = pd.DataFrame(project_equipment)
-                
-                # Display key columns
-                display_cols = ['pid_tag', 'manufacturer', 'model', 'equipment_type', 
-                              'status', 'quantity', 'location', 'price']
-                display_df = df[[col for col in display_cols if col in df.columns]]
+            if not project_equipment_df.empty:
+                display_df = project_equipment_df[PROJECT_EQUIPMENT_DISPLAY_COLS]
                 
                 st.dataframe(
                     display_df,
                     use_container_width=True,
                     hide_index=True,
-                    column_config={
-                        "pid_tag": "P&ID Tag",
-                        "manufacturer": "Manufacturer",
-                        "model": "Model",
-                        "equipment_type": "Type",
-                        "status": "Status",
-                        "quantity": st.column_config.NumberColumn("Qty", format="%d"),
-                        "location": "Location",
-                        "price": st.column_config.NumberColumn("Unit Price", format="$%.2f")
-                    }
+                    column_config=PROJECT_EQUIPMENT_COLUMN_CONFIG
                 )
                 
-                st.caption(f"Total: {len(project_equipment)} equipment items")
+                st.caption(f"Total: {len(project_equipment_df)} equipment items")
             else:
                 st.info("No equipment added yet. Use the form to add equipment from the master catalog.")
         
@@ -349,29 +717,25 @@ with tabs[2]:
             st.subheader("Add Equipment")
             
             # Get equipment master list
-            equipment_list = db['equipment'].get_all_equipment()
+            equipment_options = _cached_equipment_options(current_data_version())
             
-            if equipment_list:
-                equipment_options = {
-                    e['equipment_id']: f"{e['manufacturer']} {e['model']} ({e['equipment_type']})"
-                    for e in equipment_list
-                }
-                
+            if equipment_options:
                 with st.form("add_project_equipment"):
                     selected_equipment_id = st.selectbox(
                         "Select Equipment",
-                        options=list(equipment_options.keys()),
-                        format_func=lambda x: equipment_options[x]
+                        options=equipment_options,
+                        format_func=equipment_options.get
                     )
                     
-                    pid_tag = st.text_input("P&ID Tag*", placeholder="e.g., P-101")
+                    pid_tag = st.text_input("P&ID Tag*", placeholder="e.g., P-101").strip()
                     
                     status = st.selectbox(
                         "Status",
-                        options=["new", "existing", "replace", "remove", "TBD"]
+                        options=EQUIPMENT_STATUSES
                     )
                     
-                    quantity = st.number_input("Quantity", min_value=1, value=1, step=1)
+                    quantity = st.number_input("Quantity", min_value=1, max_value=MAX_EQUIPMENT_QUANTITY,
+                                               value=1, step=1)
                     location = st.text_input("Location", placeholder="e.g., Pump Room A")
                     notes = st.text_area("Notes")
                     
@@ -392,17 +756,58 @@ with tabs[2]:
                                     notes=notes or None
                                 )
                                 st.success(f"✓ Equipment added to project (ID: {instance_id})")
+                                bump_data_version()
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"Error adding equipment: {str(e)}")
+                
+                with st.expander("📥 Import from CSV"):
+                    st.caption(
+                        "Columns: manufacturer, model, pid_tag (required); "
+                        "status, quantity, location, notes (optional)"
+                    )
+                    with st.form("import_project_equipment"):
+                        csv_file = st.file_uploader("CSV file", type=["csv"])
+                        import_submit = st.form_submit_button("📥 Import", use_container_width=True)
+                        
+                        if import_submit:
+                            if csv_file is None:
+                                st.error("Please choose a CSV file")
+                            else:
+                                rows, errors = _read_project_equipment_csv(
+                                    csv_file, _cached_equipment_ids(current_data_version())
+                                )
+                                if errors:
+                                    shown = errors[:MAX_IMPORT_ERRORS]
+                                    if len(errors) > MAX_IMPORT_ERRORS:
+                                        shown.append(f"...and {len(errors) - MAX_IMPORT_ERRORS} more")
+                                    st.error("Nothing was imported:\n\n" + "\n".join(f"- {e}" for e in shown))
+                                elif not rows:
+                                    st.error("The CSV file has no rows")
+                                else:
+                                    try:
+                                        count = db['project_equipment'].add_equipment_to_project_bulk(
+                                            st.session_state.active_project_id, rows
+                                        )
+                                        st.success(f"✓ Imported {count} equipment items")
+                                        bump_data_version()
+                                        st.rerun()
+                                    except Exception as e:
+                                        st.error(f"Error importing equipment: {str(e)}")
             else:
                 st.warning("No equipment in master catalog. Add equipment in the Equipment Master tab first.")
 
+
+with tabs[2]:
+    render_equipment_list_tab()
+
 # ============================================================================
 # TAB 4: COST ESTIMATE
 # ============================================================================
 
-with tabs[3]:
+@st.fragment
+def render_cost_estimate_tab():
+    """Cost Estimate tab (widget changes rerun only this tab)"""
     st.header("💰 Cost Estimate")
     
     if not st.session_state.active_project_id:
@@ -415,11 +820,17 @@ with tabs[3]:
         st.markdown("- Subtotals and contingencies")
         st.markdown("- Export to formatted Excel")
 
+
+with tabs[3]:
+    render_cost_estimate_tab()
+
 # ============================================================================
 # TAB 5: SUBMITTAL GENERATOR
 # ============================================================================
 
-with tabs[4]:
+@st.fragment
+def render_submittal_tab():
+    """Submittal Generator tab (widget changes rerun only this tab)"""
     st.header("📄 Submittal Package Generator")
     
     if not st.session_state.active_project_id:
@@ -432,11 +843,17 @@ with tabs[4]:
         st.markdown("- Transmittal cover sheets")
         st.markdown("- Automatic document assembly")
 
+
+with tabs[4]:
+    render_submittal_tab()
+
 # ============================================================================
 # TAB 6: SETTINGS
 # ============================================================================
 
-with tabs[5]:
+@st.fragment
+def render_settings_tab():
+    """Settings tab (widget changes rerun only this tab)"""
     st.header("⚙️ Settings")
     
     st.subheader("Database Management")
@@ -445,21 +862,20 @@ with tabs[5]:
     
     with col1:
         st.markdown("**Database Location**")
-        from database import get_db_path
-        db_path = get_db_path()
-        st.code(str(db_path))
+        st.code(str(db['project'].db_path))
         
         st.markdown("**File Storage**")
-        file_path = Path("data/files")
-        st.code(str(file_path.absolute()))
+        st.code(str(FILE_STORAGE_PATH))
     
     with col2:
         st.markdown("**Database Statistics**")
-        total_projects = len(db['project'].get_all_projects())
-        total_equipment = len(db['equipment'].get_all_equipment())
+        stats = _cached_database_stats(current_data_version())
         
-        st.metric("Projects", total_projects)
-        st.metric("Equipment Master", total_equipment)
+        st.metric("Projects", stats['projects'])
+        st.metric("Equipment Master", stats['equipment_master'])
+        st.metric("Project Equipment", stats['project_equipment'])
+        st.metric("Quotes", stats['quotes'])
+        st.metric("Documents", stats['documents'])
     
     st.markdown("---")
     
@@ -471,3 +887,7 @@ with tabs[5]:
     
     st.markdown("---")
     st.caption("WWTP Equipment Tool v1.0 | Phase 1 - Foundation")
+
+
+with tabs[5]:
+    render_settings_tab()
@@ -2,43 +2,265 @@
 Database models and CRUD operations for WWTP Equipment Tool
 """
 
+import os
 import sqlite3
-from typing import Optional, List, Dict, Any
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime
 from pathlib import Path
-from .schema import get_db_path
+from .schema import get_db_path, configure_connection
+
+if TYPE_CHECKING:
+    # pandas is only needed by the *_df methods; import it there so scripts
+    # using just the CRUD methods don't pay its import time
+    import pandas as pd
+
+
+def _build_update_sql(table: str, key_column: str, fields: Tuple[str, ...]) -> str:
+    """Build a fixed UPDATE that only changes the fields flagged in its parameters
+    
+    Each field takes two parameters, (is_set, value), so one statement text
+    serves every combination of fields and can still set a field to NULL.
+    """
+    set_clause = ", ".join(f"{f} = CASE WHEN ? THEN ? ELSE {f} END" for f in fields)
+    return f"UPDATE {table} SET {set_clause} WHERE {key_column} = ?"
 
 
 class DatabaseManager:
-    """Main database interface class"""
+    """Main database interface class
+    
+    All managers share one connection per database file, kept open so SQLite's
+    page cache and Python's prepared-statement cache survive across calls, and
+    so writes from several managers can share one transaction. The connection
+    may be used from several Streamlit script threads, so access is serialized
+    with a lock.
+    """
+    
+    # Prepared statements kept per connection (Python's default is 128)
+    CACHED_STATEMENTS = 256
+    
+    # Rows fetched from SQLite at a time by iter_rows
+    ITER_BATCH_SIZE = 500
+    
+    # Open connections by database path, shared by every manager instance
+    _connections: Dict[Path, sqlite3.Connection] = {}
+    _lock = threading.RLock()
+    
+    # Database paths with an open transaction() block; writes there don't commit
+    _write_transactions = set()
     
     def __init__(self):
         self.db_path = get_db_path()
     
     def get_connection(self):
-        """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get the shared database connection with row factory and standard PRAGMAs"""
+        with self._lock:
+            conn = self._connections.get(self.db_path)
+            if conn is None:
+                conn = sqlite3.connect(
+                    self.db_path,
+                    cached_statements=self.CACHED_STATEMENTS,
+                    check_same_thread=False
+                )
+                conn.row_factory = sqlite3.Row
+                self._connections[self.db_path] = configure_connection(conn)
+            return conn
+    
+    def close(self) -> None:
+        """Close the shared database connection (reopened on next use)"""
+        with self._lock:
+            conn = self._connections.pop(self.db_path, None)
+            if conn is not None:
+                conn.close()
+    
+    def _idle_connection(self) -> sqlite3.Connection:
+        """Get the shared connection outside any transaction, for a new write
+        
+        Only transaction() keeps a transaction open between calls, so one found
+        here was left by a failed write. It is rolled back rather than joined,
+        so the next write can't commit its leftovers. Call with the lock held.
+        """
+        conn = self.get_connection()
+        if conn.in_transaction:
+            conn.rollback()
         return conn
     
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one commit, rolled back together on error
+        
+        Writes made by any manager inside the block skip their own commit.
+        Other threads wait until the block exits. Nested use joins the outer
+        transaction.
+        """
+        with self._lock:
+            if self.db_path in self._write_transactions:
+                yield
+                return
+            
+            conn = self._idle_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            self._write_transactions.add(self.db_path)
+            try:
+                yield
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._write_transactions.discard(self.db_path)
+    
+    @contextmanager
+    def bulk_load_mode(self):
+        """Drop secondary indexes and FTS sync triggers for a large load, then rebuild
+        
+        The whole block is one transaction: the indexes are dropped, the load
+        runs, then each index is recreated from its saved SQL once, rather than
+        updated per inserted row, and the search index is rebuilt in one pass.
+        If the block raises (or the process dies) everything is rolled back,
+        so the database never keeps its indexes dropped. UNIQUE constraints
+        stay enforced by their automatic indexes, which are not dropped, so
+        de-duplicate input first. Other threads wait until the block exits.
+        """
+        query = """
+            SELECT type, name, sql FROM sqlite_master
+            WHERE sql IS NOT NULL
+              AND (type = 'index' OR (type = 'trigger' AND name LIKE 'equipment_fts_%'))
+        """
+        with self.transaction():
+            saved = [tuple(r) for r in self.execute_rows(query)]
+            for kind, name, _ in saved:
+                self.execute_update(f"DROP {kind.upper()} IF EXISTS {name}")
+            yield
+            for _, _, sql in saved:
+                self.execute_update(sql)
+            if any(kind == 'trigger' for kind, _, _ in saved):
+                self.execute_update("INSERT INTO equipment_fts (equipment_fts) VALUES ('rebuild')")
+    
+    @contextmanager
+    def _write(self):
+        """Yield the connection for one write, committing it unless inside transaction()"""
+        with self._lock:
+            if self.db_path in self._write_transactions:
+                yield self.get_connection()
+                return
+            
+            conn = self._idle_connection()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                # Don't leave a failed statement's transaction open on the shared
+                # connection (binding errors such as OverflowError are not sqlite3.Error)
+                conn.rollback()
+                raise
+    
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict]:
         """Execute SELECT query and return results as list of dicts"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        with self._lock:
+            cursor = self.get_connection().execute(query, params)
+            # Convert while stepping the cursor rather than after fetchall(),
+            # so the Row list and the dict list are never both in memory
+            return [dict(row) for row in cursor]
+    
+    def execute_rows(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Execute SELECT query and return raw sqlite3.Row objects (no dict copies)"""
+        with self._lock:
+            return self.get_connection().execute(query, params).fetchall()
+    
+    def iter_rows(self, query: str, params: tuple = ()) -> Iterator[sqlite3.Row]:
+        """Execute SELECT query and yield sqlite3.Row objects in batches
+        
+        Reads through its own short-lived read-only connection instead of the
+        shared one, so no lock is held while the caller consumes the rows (WAL
+        lets it read alongside the shared connection). It only sees committed
+        data, not writes pending inside a transaction() block.
+        """
+        conn = sqlite3.connect(f"{self.db_path.absolute().as_uri()}?mode=ro",
+                               uri=True, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = configure_connection(conn).execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self.ITER_BATCH_SIZE)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            conn.close()
+    
+    def execute_query_df(self, query: str, params: tuple = (), dtype: Dict[str, str] = None) -> 'pd.DataFrame':
+        """Execute SELECT query and load the rows straight into a DataFrame (no dicts)
+        
+        Every column is Arrow-backed, so text and nullable numbers are not
+        boxed as Python objects on the way to st.dataframe.
+        """
+        import pandas as pd
+        
+        with self._lock:
+            return pd.read_sql_query(query, self.get_connection(), params=params,
+                                     dtype=dtype, dtype_backend="pyarrow")
+    
+    def execute_scalar(self, query: str, params: tuple = ()) -> Any:
+        """Execute SELECT query and return the first column of the first row"""
+        with self._lock:
+            row = self.get_connection().execute(query, params).fetchone()
+        return row[0] if row else None
     
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """Execute INSERT/UPDATE/DELETE and return affected rows or last row id"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        conn.commit()
-        last_id = cursor.lastrowid
-        conn.close()
-        return last_id
+        with self._write() as conn:
+            cursor = conn.execute(query, params)
+        return cursor.lastrowid
+    
+    def execute_many(self, query: str, rows: List[tuple]) -> int:
+        """Execute one INSERT/UPDATE for many parameter rows in a single transaction
+        
+        Nothing is written if any row fails. Returns the number of rows.
+        """
+        with self._write() as conn:
+            conn.executemany(query, rows)
+        return len(rows)
+    
+    def _update_fields(self, query: str, fields: Tuple[str, ...], row_id: int,
+                       values: Dict[str, Any]) -> None:
+        """Run a _build_update_sql statement for the given field values
+        
+        Unknown keys in values are ignored; nothing runs if no field is set.
+        """
+        if not values:
+            return
+        
+        # Walk the fixed field order and look each one up in the values dict,
+        # rather than filtering values against the fields tuple
+        params = []
+        has_updates = False
+        for field in fields:
+            if field in values:
+                params += (True, values[field])
+                has_updates = True
+            else:
+                params += (False, None)
+        
+        if not has_updates:
+            return
+        
+        params.append(row_id)
+        self.execute_update(query, tuple(params))
+    
+    def get_database_stats(self) -> Dict[str, int]:
+        """Get row counts for the main tables in a single statement"""
+        query = """
+            SELECT
+                (SELECT COUNT(*) FROM projects) AS projects,
+                (SELECT COUNT(*) FROM equipment_master) AS equipment_master,
+                (SELECT COUNT(*) FROM project_equipment) AS project_equipment,
+                (SELECT COUNT(*) FROM quotes) AS quotes,
+                (SELECT COUNT(*) FROM documents) AS documents
+        """
+        return dict(self.execute_rows(query)[0])
 
 
 # ============================================================================
@@ -48,6 +270,10 @@ class DatabaseManager:
 class ProjectManager(DatabaseManager):
     """Manage projects"""
     
+    # Fields accepted by update_project
+    UPDATE_FIELDS = ('name', 'client', 'job_number', 'phase', 'notes')
+    UPDATE_SQL = _build_update_sql('projects', 'project_id', UPDATE_FIELDS)
+    
     def create_project(self, name: str, client: str = None, job_number: str = None, 
                       phase: str = None, notes: str = None) -> int:
         """Create new project"""
@@ -70,24 +296,15 @@ class ProjectManager(DatabaseManager):
     
     def update_project(self, project_id: int, **kwargs) -> None:
         """Update project fields"""
-        allowed_fields = ['name', 'client', 'job_number', 'phase', 'notes']
-        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
-        
-        if not updates:
-            return
-        
-        set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-        query = f"UPDATE projects SET {set_clause} WHERE project_id = ?"
-        params = tuple(updates.values()) + (project_id,)
-        
-        self.execute_update(query, params)
+        self._update_fields(self.UPDATE_SQL, self.UPDATE_FIELDS, project_id, kwargs)
     
     def delete_project(self, project_id: int) -> None:
         """Delete project and all associated equipment instances"""
-        # First delete project equipment
-        self.execute_update("DELETE FROM project_equipment WHERE project_id = ?", (project_id,))
-        # Then delete project
-        self.execute_update("DELETE FROM projects WHERE project_id = ?", (project_id,))
+        with self.transaction():
+            # First delete project equipment
+            self.execute_update("DELETE FROM project_equipment WHERE project_id = ?", (project_id,))
+            # Then delete project
+            self.execute_update("DELETE FROM projects WHERE project_id = ?", (project_id,))
 
 
 # ============================================================================
@@ -97,81 +314,226 @@ class ProjectManager(DatabaseManager):
 class EquipmentManager(DatabaseManager):
     """Manage equipment master catalog"""
     
+    # Columns that may be requested by name (guards dynamic SELECT lists)
+    COLUMNS = (
+        'equipment_id', 'manufacturer', 'model', 'equipment_type', 'equipment_subtype',
+        'power_hp', 'flow_gpm', 'head_ft', 'voltage', 'rpm',
+        'power_hp_verified', 'flow_gpm_verified', 'head_ft_verified',
+        'material', 'connection_size', 'weight_lbs', 'notes', 'created_date'
+    )
+    
+    # Column types for DataFrames: Arrow-backed float64 numerics and strings, so
+    # st.dataframe can serialize them without boxing every cell as a Python object
+    COLUMN_DTYPES = {
+        'power_hp': 'double[pyarrow]', 'flow_gpm': 'double[pyarrow]',
+        'head_ft': 'double[pyarrow]', 'rpm': 'double[pyarrow]',
+        'power_hp_verified': 'double[pyarrow]', 'flow_gpm_verified': 'double[pyarrow]',
+        'head_ft_verified': 'double[pyarrow]', 'weight_lbs': 'double[pyarrow]',
+        'manufacturer': 'string[pyarrow]', 'model': 'string[pyarrow]',
+        'equipment_type': 'string[pyarrow]', 'equipment_subtype': 'string[pyarrow]',
+        'voltage': 'string[pyarrow]', 'material': 'string[pyarrow]',
+        'connection_size': 'string[pyarrow]', 'notes': 'string[pyarrow]'
+    }
+    
+    # Optional fields accepted by create_equipment
+    OPTIONAL_FIELDS = (
+        'equipment_subtype', 'power_hp', 'flow_gpm', 'head_ft', 'voltage', 'rpm',
+        'power_hp_verified', 'flow_gpm_verified', 'head_ft_verified',
+        'material', 'connection_size', 'weight_lbs', 'notes'
+    )
+    
+    # Always insert every column so the statement text is fixed and its
+    # prepared statement is reused (missing fields are stored as NULL)
+    INSERT_EQUIPMENT_SQL = (
+        "INSERT INTO equipment_master (manufacturer, model, equipment_type, "
+        + ", ".join(OPTIONAL_FIELDS)
+        + ") VALUES (" + ", ".join(["?"] * (3 + len(OPTIONAL_FIELDS))) + ")"
+    )
+    
+    # Fields accepted by update_equipment
+    UPDATE_FIELDS = ('manufacturer', 'model', 'equipment_type') + OPTIONAL_FIELDS
+    UPDATE_SQL = _build_update_sql('equipment_master', 'equipment_id', UPDATE_FIELDS)
+    
+    def __init__(self):
+        super().__init__()
+        self._fts_index = None
+    
     def create_equipment(self, manufacturer: str, model: str, equipment_type: str, **kwargs) -> int:
         """Create new equipment in master catalog"""
-        allowed_fields = [
-            'equipment_subtype', 'power_hp', 'flow_gpm', 'head_ft', 'voltage', 'rpm',
-            'power_hp_verified', 'flow_gpm_verified', 'head_ft_verified',
-            'material', 'connection_size', 'weight_lbs', 'notes'
-        ]
-        
-        # Build dynamic INSERT
-        fields = ['manufacturer', 'model', 'equipment_type']
-        values = [manufacturer, model, equipment_type]
-        
-        for field in allowed_fields:
-            if field in kwargs and kwargs[field] is not None:
-                fields.append(field)
-                values.append(kwargs[field])
-        
-        placeholders = ", ".join(["?"] * len(fields))
-        query = f"INSERT INTO equipment_master ({', '.join(fields)}) VALUES ({placeholders})"
+        return self.execute_update(
+            self.INSERT_EQUIPMENT_SQL,
+            self._insert_values(manufacturer, model, equipment_type, **kwargs)
+        )
+    
+    def create_equipment_bulk(self, items: List[Dict[str, Any]]) -> int:
+        """Create many equipment records in one transaction
         
-        return self.execute_update(query, tuple(values))
+        Each item is a dict with manufacturer, model, equipment_type and any
+        optional fields. Nothing is inserted if any row fails. Returns the
+        number of rows inserted.
+        """
+        rows = [self._insert_values(**item) for item in items]
+        return self.execute_many(self.INSERT_EQUIPMENT_SQL, rows)
+    
+    def _insert_values(self, manufacturer: str, model: str, equipment_type: str, **kwargs) -> tuple:
+        """Build the INSERT_EQUIPMENT_SQL parameters, NULL for missing fields"""
+        return (manufacturer, model, equipment_type) + tuple(
+            kwargs.get(field) for field in self.OPTIONAL_FIELDS
+        )
+    
+    def _select_list(self, columns: List[str] = None) -> str:
+        """Build a SELECT column list, rejecting names outside COLUMNS"""
+        if not columns:
+            return "*"
+        invalid = [col for col in columns if col not in self.COLUMNS]
+        if invalid:
+            raise ValueError(f"Unknown equipment columns: {', '.join(invalid)}")
+        return ", ".join(columns)
     
-    def get_all_equipment(self, equipment_type: str = None) -> List[Dict]:
-        """Get all equipment, optionally filtered by type"""
+    def get_all_equipment(self, equipment_type: str = None, columns: List[str] = None) -> List[Dict]:
+        """Get all equipment, optionally filtered by type and limited to some columns"""
+        select_list = self._select_list(columns)
         if equipment_type:
-            query = "SELECT * FROM equipment_master WHERE equipment_type = ? ORDER BY manufacturer, model"
+            query = f"SELECT {select_list} FROM equipment_master WHERE equipment_type = ? ORDER BY manufacturer, model"
             return self.execute_query(query, (equipment_type,))
         else:
-            query = "SELECT * FROM equipment_master ORDER BY manufacturer, model"
+            query = f"SELECT {select_list} FROM equipment_master ORDER BY manufacturer, model"
             return self.execute_query(query)
     
+    def iter_all_equipment(self, equipment_type: str = None,
+                           columns: List[str] = None) -> Iterator[Dict]:
+        """Yield equipment dicts one at a time (same filters as get_all_equipment)"""
+        select_list = self._select_list(columns)
+        if equipment_type:
+            query = f"SELECT {select_list} FROM equipment_master WHERE equipment_type = ? ORDER BY manufacturer, model"
+            rows = self.iter_rows(query, (equipment_type,))
+        else:
+            query = f"SELECT {select_list} FROM equipment_master ORDER BY manufacturer, model"
+            rows = self.iter_rows(query)
+        for row in rows:
+            yield dict(row)
+    
+    def get_all_equipment_df(self, columns: List[str] = None, limit: int = None,
+                             offset: int = 0) -> 'pd.DataFrame':
+        """Get all equipment as a typed DataFrame, optionally limited to some columns
+        and to one page of ``limit`` rows starting at ``offset``"""
+        columns = list(columns) if columns else list(self.COLUMNS)
+        query = f"SELECT {self._select_list(columns)} FROM equipment_master ORDER BY manufacturer, model"
+        params = ()
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params = (limit, offset)
+        dtype = {col: t for col, t in self.COLUMN_DTYPES.items() if col in columns}
+        return self.execute_query_df(query, params, dtype=dtype)
+    
     def get_equipment(self, equipment_id: int) -> Optional[Dict]:
         """Get equipment by ID"""
         query = "SELECT * FROM equipment_master WHERE equipment_id = ?"
         results = self.execute_query(query, (equipment_id,))
         return results[0] if results else None
     
-    def search_equipment(self, search_term: str) -> List[Dict]:
-        """Search equipment by manufacturer, model, or type"""
+    def search_equipment(self, search_term: str, prefix: bool = False) -> List[Dict]:
+        """Search equipment by manufacturer, model, type, subtype, or notes
+        
+        Uses the equipment_fts full-text index (prefix match on every word) when
+        available, otherwise falls back to a LIKE scan of the same columns. With
+        prefix=True only values starting with the term match, and free-text notes
+        are left out; the LIKE fallback can then use the NOCASE indexes instead
+        of scanning.
+        """
+        match_query = self._build_match_query(search_term, prefix)
+        if match_query and self._has_fts_index():
+            query = """
+                SELECT em.* FROM equipment_fts f
+                JOIN equipment_master em ON em.equipment_id = f.rowid
+                WHERE equipment_fts MATCH ?
+                ORDER BY em.manufacturer, em.model
+            """
+            try:
+                return self.execute_query(query, (match_query,))
+            except sqlite3.OperationalError:
+                pass  # Unparseable MATCH expression, use LIKE instead
+        
+        if prefix:
+            query = """
+                SELECT * FROM equipment_master 
+                WHERE manufacturer LIKE ?1 OR model LIKE ?1 OR equipment_type LIKE ?1
+                   OR equipment_subtype LIKE ?1
+                ORDER BY manufacturer, model
+            """
+            return self.execute_query(query, (f"{search_term}%",))
+        
         query = """
             SELECT * FROM equipment_master 
-            WHERE manufacturer LIKE ? OR model LIKE ? OR equipment_type LIKE ?
+            WHERE manufacturer LIKE ?1 OR model LIKE ?1 OR equipment_type LIKE ?1
+               OR equipment_subtype LIKE ?1 OR notes LIKE ?1
             ORDER BY manufacturer, model
         """
-        search_pattern = f"%{search_term}%"
-        return self.execute_query(query, (search_pattern, search_pattern, search_pattern))
+        return self.execute_query(query, (f"%{search_term}%",))
     
-    def update_equipment(self, equipment_id: int, **kwargs) -> None:
-        """Update equipment fields"""
-        allowed_fields = [
-            'manufacturer', 'model', 'equipment_type', 'equipment_subtype',
-            'power_hp', 'flow_gpm', 'head_ft', 'voltage', 'rpm',
-            'power_hp_verified', 'flow_gpm_verified', 'head_ft_verified',
-            'material', 'connection_size', 'weight_lbs', 'notes'
-        ]
-        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+    def search_equipment_in_project(self, project_id: int, search_term: str,
+                                    limit: int = 50) -> List[Dict]:
+        """Search only the catalog equipment used in one project
         
-        if not updates:
-            return
-        
-        set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-        query = f"UPDATE equipment_master SET {set_clause} WHERE equipment_id = ?"
-        params = tuple(updates.values()) + (equipment_id,)
+        Matches the same columns as search_equipment's LIKE path,
+        but over the project's few rows instead of the whole catalog.
+        """
+        query = """
+            SELECT * FROM equipment_master
+            WHERE equipment_id IN (
+                SELECT equipment_id FROM project_equipment WHERE project_id = ?1
+            )
+              AND (manufacturer LIKE ?2 OR model LIKE ?2 OR equipment_type LIKE ?2
+                   OR equipment_subtype LIKE ?2 OR notes LIKE ?2)
+            ORDER BY manufacturer, model
+            LIMIT ?3
+        """
+        return self.execute_query(query, (project_id, f"%{search_term}%", limit))
+    
+    def _has_fts_index(self) -> bool:
+        """Check (once) whether the equipment_fts table exists"""
+        if self._fts_index is None:
+            query = "SELECT COUNT(*) FROM sqlite_master WHERE name = 'equipment_fts'"
+            self._fts_index = bool(self.execute_scalar(query))
+        return self._fts_index
+    
+    @staticmethod
+    def _build_match_query(search_term: str, prefix: bool = False) -> str:
+        """Turn user input into an FTS5 query: each word quoted and prefix-matched
         
-        self.execute_update(query, params)
+        With prefix=True the words must instead start a value, as one phrase
+        anchored to the first token of a column other than notes.
+        """
+        words = [w.replace('"', '""') for w in search_term.split()]
+        if prefix and words:
+            phrase = " ".join(words)
+            return f'{{manufacturer model equipment_type equipment_subtype}} : ^"{phrase}"*'
+        return " ".join(f'"{w}"*' for w in words)
+    
+    def update_equipment(self, equipment_id: int, **kwargs) -> None:
+        """Update equipment fields"""
+        self._update_fields(self.UPDATE_SQL, self.UPDATE_FIELDS, equipment_id, kwargs)
     
     def delete_equipment(self, equipment_id: int) -> None:
         """Delete equipment (will fail if referenced in project_equipment)"""
         self.execute_update("DELETE FROM equipment_master WHERE equipment_id = ?", (equipment_id,))
     
+    def get_document_quote_counts(self) -> Dict[int, Tuple[int, int]]:
+        """Get (document count, quote count) for every equipment item in one query"""
+        query = """
+            SELECT
+                em.equipment_id,
+                (SELECT COUNT(*) FROM documents d WHERE d.equipment_id = em.equipment_id) AS document_count,
+                (SELECT COUNT(*) FROM quotes q WHERE q.equipment_id = em.equipment_id) AS quote_count
+            FROM equipment_master em
+        """
+        return {r['equipment_id']: (r['document_count'], r['quote_count'])
+                for r in self.execute_rows(query)}
+    
     def get_equipment_types(self) -> List[str]:
         """Get list of unique equipment types"""
         query = "SELECT DISTINCT equipment_type FROM equipment_master ORDER BY equipment_type"
-        results = self.execute_query(query)
-        return [r['equipment_type'] for r in results]
+        return [r['equipment_type'] for r in self.execute_rows(query)]
 
 
 # ============================================================================
@@ -181,56 +543,125 @@ class EquipmentManager(DatabaseManager):
 class ProjectEquipmentManager(DatabaseManager):
     """Manage equipment instances within projects"""
     
+    # Fields accepted by update_project_equipment
+    UPDATE_FIELDS = ('pid_tag', 'status', 'quantity', 'location', 'notes', 'selected_quote_id')
+    UPDATE_SQL = _build_update_sql('project_equipment', 'instance_id', UPDATE_FIELDS)
+    
+    ADD_EQUIPMENT_SQL = """
+        INSERT INTO project_equipment 
+        (project_id, equipment_id, pid_tag, status, quantity, location, notes, selected_quote_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
     def add_equipment_to_project(self, project_id: int, equipment_id: int, 
                                  pid_tag: str = None, status: str = 'new',
                                  quantity: int = 1, location: str = None,
                                  notes: str = None, selected_quote_id: int = None) -> int:
         """Add equipment instance to project"""
-        query = """
-            INSERT INTO project_equipment 
-            (project_id, equipment_id, pid_tag, status, quantity, location, notes, selected_quote_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        return self.execute_update(self.ADD_EQUIPMENT_SQL, (project_id, equipment_id, pid_tag, status, 
+                                                            quantity, location, notes, selected_quote_id))
+    
+    def add_equipment_to_project_bulk(self, project_id: int, rows: List[Dict[str, Any]]) -> int:
+        """Add many equipment instances to a project in one transaction
+        
+        Each row is a dict with equipment_id and any of pid_tag, status,
+        quantity, location, notes and selected_quote_id. Nothing is added if
+        any row fails. Returns the number of rows added.
         """
-        return self.execute_update(query, (project_id, equipment_id, pid_tag, status, 
-                                           quantity, location, notes, selected_quote_id))
+        params = [
+            (project_id, row['equipment_id'], row.get('pid_tag'), row.get('status') or 'new',
+             1 if row.get('quantity') is None else row['quantity'], row.get('location'),
+             row.get('notes'), row.get('selected_quote_id'))
+            for row in rows
+        ]
+        return self.execute_many(self.ADD_EQUIPMENT_SQL, params)
     
-    def get_project_equipment(self, project_id: int) -> List[Dict]:
-        """Get all equipment for a project with full details"""
-        query = """
+    def add_equipment_bundle(self, project_id: int, equipment_id: int,
+                             quote: Dict[str, Any] = None,
+                             documents: List[Dict[str, Any]] = (),
+                             **instance_kwargs) -> Dict[str, Any]:
+        """Add equipment to a project with its quote and documents in one transaction
+        
+        quote takes create_quote arguments (minus equipment_id) and becomes
+        the instance's selected quote; each document takes create_document
+        arguments. instance_kwargs go to add_equipment_to_project. Nothing is
+        saved if any insert fails. Returns the new instance_id, quote_id
+        (None without a quote) and document_ids.
+        """
+        with self.transaction():
+            quote_id = None
+            if quote:
+                quote_id = QuoteManager().create_quote(equipment_id=equipment_id, **quote)
+                instance_kwargs['selected_quote_id'] = quote_id
+            
+            instance_id = self.add_equipment_to_project(project_id, equipment_id, **instance_kwargs)
+            
+            document_manager = DocumentManager()
+            document_ids = [document_manager.create_document(equipment_id=equipment_id, **document)
+                            for document in documents]
+        
+        return {'instance_id': instance_id, 'quote_id': quote_id, 'document_ids': document_ids}
+    
+    # Project equipment joined with catalog details; selected quote details
+    # come from the quote_* columns that schema triggers keep in sync
+    PROJECT_EQUIPMENT_QUERY = """
             SELECT 
-                pe.*,
+                pe.instance_id,
+                pe.project_id,
+                pe.equipment_id,
+                pe.pid_tag,
+                pe.status,
+                pe.quantity,
+                pe.location,
+                pe.notes,
+                pe.selected_quote_id,
+                pe.quote_vendor AS vendor,
+                pe.quote_price AS price,
+                pe.quote_currency AS currency,
+                pe.quote_lead_time_weeks AS lead_time_weeks,
                 em.manufacturer,
                 em.model,
                 em.equipment_type,
                 em.equipment_subtype,
                 em.power_hp,
                 em.flow_gpm,
-                em.head_ft,
-                q.vendor,
-                q.price,
-                q.currency,
-                q.lead_time_weeks
+                em.head_ft
             FROM project_equipment pe
             LEFT JOIN equipment_master em ON pe.equipment_id = em.equipment_id
-            LEFT JOIN quotes q ON pe.selected_quote_id = q.quote_id
             WHERE pe.project_id = ?
             ORDER BY pe.pid_tag
         """
-        return self.execute_query(query, (project_id,))
+    
+    # Numeric columns that can be entirely NULL (e.g. no quote selected yet);
+    # without these the Arrow backend would type them as strings
+    # (equipment columns reuse EquipmentManager's types so the two frames match)
+    PROJECT_EQUIPMENT_DTYPES = {
+        'quantity': 'int64[pyarrow]', 'selected_quote_id': 'int64[pyarrow]',
+        'price': 'double[pyarrow]', 'lead_time_weeks': 'int64[pyarrow]',
+        **{col: EquipmentManager.COLUMN_DTYPES[col] for col in ('power_hp', 'flow_gpm', 'head_ft')}
+    }
+    
+    def get_project_equipment(self, project_id: int) -> List[Dict]:
+        """Get all equipment for a project with full details"""
+        return self.execute_query(self.PROJECT_EQUIPMENT_QUERY, (project_id,))
+    
+    def get_project_equipment_df(self, project_id: int) -> 'pd.DataFrame':
+        """Get all equipment for a project with full details as a DataFrame"""
+        return self.execute_query_df(self.PROJECT_EQUIPMENT_QUERY, (project_id,),
+                                     dtype=self.PROJECT_EQUIPMENT_DTYPES)
+    
+    def get_counts_by_project(self) -> Dict[int, int]:
+        """Get number of equipment instances for every project in one query"""
+        query = """
+            SELECT project_id, COUNT(*) AS equipment_count
+            FROM project_equipment
+            GROUP BY project_id
+        """
+        return {r['project_id']: r['equipment_count'] for r in self.execute_rows(query)}
     
     def update_project_equipment(self, instance_id: int, **kwargs) -> None:
         """Update project equipment instance"""
-        allowed_fields = ['pid_tag', 'status', 'quantity', 'location', 'notes', 'selected_quote_id']
-        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
-        
-        if not updates:
-            return
-        
-        set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-        query = f"UPDATE project_equipment SET {set_clause} WHERE instance_id = ?"
-        params = tuple(updates.values()) + (instance_id,)
-        
-        self.execute_update(query, params)
+        self._update_fields(self.UPDATE_SQL, self.UPDATE_FIELDS, instance_id, kwargs)
     
     def delete_project_equipment(self, instance_id: int) -> None:
         """Remove equipment instance from project"""
@@ -244,48 +675,70 @@ class ProjectEquipmentManager(DatabaseManager):
 class QuoteManager(DatabaseManager):
     """Manage equipment quotes"""
     
+    # Fields accepted by update_quote
+    UPDATE_FIELDS = (
+        'vendor', 'price', 'currency', 'lead_time_weeks', 'quote_date',
+        'quote_number', 'quote_file_path', 'is_current', 'notes'
+    )
+    UPDATE_SQL = _build_update_sql('quotes', 'quote_id', UPDATE_FIELDS)
+    
+    CREATE_QUOTE_SQL = """
+        INSERT INTO quotes 
+        (equipment_id, vendor, price, currency, lead_time_weeks, 
+         quote_date, quote_number, quote_file_path, is_current, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
     def create_quote(self, equipment_id: int, vendor: str, price: float = None,
                     currency: str = 'USD', lead_time_weeks: int = None,
                     quote_date: str = None, quote_number: str = None,
                     quote_file_path: str = None, is_current: bool = True,
                     notes: str = None) -> int:
         """Create new quote for equipment"""
-        query = """
-            INSERT INTO quotes 
-            (equipment_id, vendor, price, currency, lead_time_weeks, 
-             quote_date, quote_number, quote_file_path, is_current, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        return self.execute_update(self.CREATE_QUOTE_SQL, (equipment_id, vendor, price, currency, 
+                                                           lead_time_weeks, quote_date, quote_number,
+                                                           quote_file_path, is_current, notes))
+    
+    def create_quotes_bulk(self, quotes: List[Dict[str, Any]]) -> int:
+        """Create many quotes in one transaction
+        
+        Each item is a dict with equipment_id, vendor and any of the optional
+        create_quote fields (same defaults). Nothing is inserted if any row
+        fails. Returns the number of quotes created.
         """
-        return self.execute_update(query, (equipment_id, vendor, price, currency, 
-                                           lead_time_weeks, quote_date, quote_number,
-                                           quote_file_path, is_current, notes))
+        rows = [
+            (q['equipment_id'], q['vendor'], q.get('price'), q.get('currency', 'USD'),
+             q.get('lead_time_weeks'), q.get('quote_date'), q.get('quote_number'),
+             q.get('quote_file_path'), q.get('is_current', True), q.get('notes'))
+            for q in quotes
+        ]
+        return self.execute_many(self.CREATE_QUOTE_SQL, rows)
     
-    def get_equipment_quotes(self, equipment_id: int) -> List[Dict]:
-        """Get all quotes for equipment"""
-        query = "SELECT * FROM quotes WHERE equipment_id = ? ORDER BY quote_date DESC"
+    def get_equipment_quotes(self, equipment_id: int, current_only: bool = False) -> List[Dict]:
+        """Get all quotes for equipment, optionally only the current ones"""
+        if current_only:
+            query = "SELECT * FROM quotes WHERE equipment_id = ? AND is_current = 1 ORDER BY quote_date DESC"
+        else:
+            query = "SELECT * FROM quotes WHERE equipment_id = ? ORDER BY quote_date DESC"
         return self.execute_query(query, (equipment_id,))
     
+    def get_quotes_by_equipment(self) -> Dict[int, List[Dict]]:
+        """Get all quotes grouped by equipment ID (newest first) in one query"""
+        query = "SELECT * FROM quotes ORDER BY equipment_id, quote_date DESC"
+        quotes_by_equipment = {}
+        for quote in self.execute_query(query):
+            quotes_by_equipment.setdefault(quote['equipment_id'], []).append(quote)
+        return quotes_by_equipment
+    
     def get_current_quote(self, equipment_id: int) -> Optional[Dict]:
-        """Get current quote for equipment"""
-        query = "SELECT * FROM quotes WHERE equipment_id = ? AND is_current = 1 LIMIT 1"
+        """Get current quote for equipment (the newest if several are current)"""
+        query = "SELECT * FROM quotes WHERE equipment_id = ? AND is_current = 1 ORDER BY quote_date DESC LIMIT 1"
         results = self.execute_query(query, (equipment_id,))
         return results[0] if results else None
     
     def update_quote(self, quote_id: int, **kwargs) -> None:
         """Update quote fields"""
-        allowed_fields = ['vendor', 'price', 'currency', 'lead_time_weeks', 
-                         'quote_date', 'quote_number', 'quote_file_path', 
-                         'is_current', 'notes']
-        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
-        
-        if not updates:
-            return
-        
-        set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-        query = f"UPDATE quotes SET {set_clause} WHERE quote_id = ?"
-        params = tuple(updates.values()) + (quote_id,)
-        
-        self.execute_update(query, params)
+        self._update_fields(self.UPDATE_SQL, self.UPDATE_FIELDS, quote_id, kwargs)
     
     def delete_quote(self, quote_id: int) -> None:
         """Delete quote"""
@@ -299,20 +752,61 @@ class QuoteManager(DatabaseManager):
 class DocumentManager(DatabaseManager):
     """Manage equipment documents"""
     
+    # Fields accepted by update_document
+    UPDATE_FIELDS = (
+        'document_type', 'file_name', 'file_path', 'file_size_kb',
+        'version', 'document_date', 'notes'
+    )
+    UPDATE_SQL = _build_update_sql('documents', 'document_id', UPDATE_FIELDS)
+    
+    CREATE_DOCUMENT_SQL = """
+        INSERT INTO documents 
+        (equipment_id, document_type, file_name, file_path, 
+         file_size_kb, version, document_date, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
     def create_document(self, equipment_id: int, document_type: str, 
                        file_name: str, file_path: str,
                        file_size_kb: int = None, version: str = None,
                        document_date: str = None, notes: str = None) -> int:
         """Register new document for equipment"""
-        query = """
-            INSERT INTO documents 
-            (equipment_id, document_type, file_name, file_path, 
-             file_size_kb, version, document_date, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        return self.execute_update(self.CREATE_DOCUMENT_SQL, (equipment_id, document_type, file_name, 
+                                                              file_path, file_size_kb, version, 
+                                                              document_date, notes))
+    
+    def create_documents_bulk(self, documents: List[Dict[str, Any]]) -> int:
+        """Register many documents in one transaction
+        
+        Each item is a dict with equipment_id, document_type, file_name,
+        file_path and any of the optional create_document fields. Nothing is
+        inserted if any row fails. Returns the number of documents registered.
+        """
+        rows = [
+            (d['equipment_id'], d['document_type'], d['file_name'], d['file_path'],
+             d.get('file_size_kb'), d.get('version'), d.get('document_date'), d.get('notes'))
+            for d in documents
+        ]
+        return self.execute_many(self.CREATE_DOCUMENT_SQL, rows)
+    
+    def create_documents_from_dir(self, equipment_id: int, dir_path: str,
+                                  document_type: str) -> int:
+        """Register every file in a folder as a document of one type
+        
+        Reads the folder with a single os.scandir pass (file type comes with
+        each entry; size is one stat per file) and inserts all rows in one
+        transaction. Hidden files and subfolders are skipped. Returns the
+        number of documents registered.
         """
-        return self.execute_update(query, (equipment_id, document_type, file_name, 
-                                           file_path, file_size_kb, version, 
-                                           document_date, notes))
+        with os.scandir(dir_path) as entries:
+            rows = [
+                (equipment_id, document_type, entry.name, entry.path,
+                 entry.stat().st_size // 1024, None, None, None)
+                for entry in entries
+                if entry.is_file() and not entry.name.startswith('.')
+            ]
+        rows.sort(key=lambda row: row[2])
+        return self.execute_many(self.CREATE_DOCUMENT_SQL, rows)
     
     def get_equipment_documents(self, equipment_id: int, document_type: str = None) -> List[Dict]:
         """Get all documents for equipment, optionally filtered by type"""
@@ -329,18 +823,7 @@ class DocumentManager(DatabaseManager):
     
     def update_document(self, document_id: int, **kwargs) -> None:
         """Update document metadata"""
-        allowed_fields = ['document_type', 'file_name', 'file_path', 
-                         'file_size_kb', 'version', 'document_date', 'notes']
-        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
-        
-        if not updates:
-            return
-        
-        set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-        query = f"UPDATE documents SET {set_clause} WHERE document_id = ?"
-        params = tuple(updates.values()) + (document_id,)
-        
-        self.execute_update(query, params)
+        self._update_fields(self.UPDATE_SQL, self.UPDATE_FIELDS, document_id, kwargs)
     
     def delete_document(self, document_id: int) -> None:
         """Delete document record"""
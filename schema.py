@@ -14,12 +14,66 @@ def get_db_path():
     return db_dir / "wwtp_equipment.db"
 
 
+# Bump whenever create_schema changes; stored in the file as PRAGMA user_version
+SCHEMA_VERSION = 7
+
+# Per-connection tuning applied to every connection the app opens
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",        # Enforce the REFERENCES clauses below
+    "PRAGMA synchronous = NORMAL",     # Safe with WAL, avoids fsync on every commit
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped reads
+    "PRAGMA cache_size = -65536",      # 64 MB page cache, so bulk loads stay in memory
+)
+
+
+# Selected-quote columns copied onto project_equipment (added to older files)
+QUOTE_CACHE_COLUMNS = (
+    ('quote_vendor', 'TEXT'),
+    ('quote_price', 'REAL'),
+    ('quote_currency', 'TEXT'),
+    ('quote_lead_time_weeks', 'INTEGER'),
+)
+
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply the standard PRAGMAs to a new connection"""
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_schema_version() -> int:
+    """Get the schema version stored in the database file (0 if never created)"""
+    db_path = get_db_path()
+    if not db_path.exists():
+        return 0
+    conn = sqlite3.connect(db_path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    return version
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    """Check whether the SQLite library was compiled with FTS5"""
+    options = [row[0] for row in conn.execute("PRAGMA compile_options")]
+    return "ENABLE_FTS5" in options
+
+
 def create_schema():
     """Create all database tables and indexes"""
     db_path = get_db_path()
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
+    # Larger pages keep wide equipment rows together; only applies to a new,
+    # empty file, so it must come before WAL mode and the first table
+    cursor.execute("PRAGMA page_size = 8192")
+    
+    # WAL lets readers proceed while a write commits (persists in the file)
+    cursor.execute("PRAGMA journal_mode = WAL")
+    configure_connection(conn)
+    
     # 1. PROJECTS TABLE
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS projects (
@@ -65,6 +119,57 @@ def create_schema():
         )
     """)
     
+    # 2a. EQUIPMENT FULL-TEXT SEARCH INDEX (external content, kept in sync by triggers)
+    has_fts5 = fts5_available(conn)
+    if has_fts5:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'equipment_fts'")
+        fts_exists = cursor.fetchone() is not None
+        
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS equipment_fts USING fts5(
+                manufacturer, model, equipment_type, equipment_subtype, notes,
+                content='equipment_master', content_rowid='equipment_id'
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS equipment_fts_insert AFTER INSERT ON equipment_master
+            BEGIN
+                INSERT INTO equipment_fts (rowid, manufacturer, model, equipment_type,
+                                           equipment_subtype, notes)
+                VALUES (new.equipment_id, new.manufacturer, new.model, new.equipment_type,
+                        new.equipment_subtype, new.notes);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS equipment_fts_delete AFTER DELETE ON equipment_master
+            BEGIN
+                INSERT INTO equipment_fts (equipment_fts, rowid, manufacturer, model, equipment_type,
+                                           equipment_subtype, notes)
+                VALUES ('delete', old.equipment_id, old.manufacturer, old.model, old.equipment_type,
+                        old.equipment_subtype, old.notes);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS equipment_fts_update AFTER UPDATE ON equipment_master
+            BEGIN
+                INSERT INTO equipment_fts (equipment_fts, rowid, manufacturer, model, equipment_type,
+                                           equipment_subtype, notes)
+                VALUES ('delete', old.equipment_id, old.manufacturer, old.model, old.equipment_type,
+                        old.equipment_subtype, old.notes);
+                INSERT INTO equipment_fts (rowid, manufacturer, model, equipment_type,
+                                           equipment_subtype, notes)
+                VALUES (new.equipment_id, new.manufacturer, new.model, new.equipment_type,
+                        new.equipment_subtype, new.notes);
+            END
+        """)
+        
+        # Index equipment that existed before the FTS table was added
+        if not fts_exists:
+            cursor.execute("INSERT INTO equipment_fts (equipment_fts) VALUES ('rebuild')")
+    
     # 3. PROJECT EQUIPMENT INSTANCES TABLE
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS project_equipment (
@@ -80,6 +185,12 @@ def create_schema():
             
             selected_quote_id INTEGER,  -- FK to quotes table
             
+            -- Copy of the selected quote, kept current by triggers (see 6.)
+            quote_vendor TEXT,
+            quote_price REAL,
+            quote_currency TEXT,
+            quote_lead_time_weeks INTEGER,
+            
             FOREIGN KEY (project_id) REFERENCES projects(project_id),
             FOREIGN KEY (equipment_id) REFERENCES equipment_master(equipment_id),
             FOREIGN KEY (selected_quote_id) REFERENCES quotes(quote_id),
@@ -129,22 +240,119 @@ def create_schema():
         )
     """)
     
+    # 6. SELECTED QUOTE DETAILS ON PROJECT EQUIPMENT
+    # Project equipment listings read the selected quote's vendor, price, etc.
+    # from these columns instead of joining quotes on every render
+    cursor.execute("PRAGMA table_info(project_equipment)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    added_columns = False
+    for column, column_type in QUOTE_CACHE_COLUMNS:
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE project_equipment ADD COLUMN {column} {column_type}")
+            added_columns = True
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS project_equipment_quote_insert
+        AFTER INSERT ON project_equipment
+        WHEN new.selected_quote_id IS NOT NULL
+        BEGIN
+            UPDATE project_equipment
+            SET (quote_vendor, quote_price, quote_currency, quote_lead_time_weeks) =
+                (SELECT vendor, price, currency, lead_time_weeks
+                 FROM quotes WHERE quote_id = new.selected_quote_id)
+            WHERE instance_id = new.instance_id;
+        END
+    """)
+    
+    # The update_* methods write every column on each call, so the update
+    # triggers only refresh the copy when a quote value actually changed.
+    # Recreated so databases made before the WHEN guards get them.
+    cursor.execute("DROP TRIGGER IF EXISTS project_equipment_quote_select")
+    cursor.execute("""
+        CREATE TRIGGER project_equipment_quote_select
+        AFTER UPDATE OF selected_quote_id ON project_equipment
+        WHEN old.selected_quote_id IS NOT new.selected_quote_id
+        BEGIN
+            UPDATE project_equipment
+            SET (quote_vendor, quote_price, quote_currency, quote_lead_time_weeks) =
+                (SELECT vendor, price, currency, lead_time_weeks
+                 FROM quotes WHERE quote_id = new.selected_quote_id)
+            WHERE instance_id = new.instance_id;
+        END
+    """)
+    
+    cursor.execute("DROP TRIGGER IF EXISTS quotes_project_equipment_update")
+    cursor.execute("""
+        CREATE TRIGGER quotes_project_equipment_update
+        AFTER UPDATE OF vendor, price, currency, lead_time_weeks ON quotes
+        WHEN old.vendor IS NOT new.vendor OR old.price IS NOT new.price
+          OR old.currency IS NOT new.currency OR old.lead_time_weeks IS NOT new.lead_time_weeks
+        BEGIN
+            UPDATE project_equipment
+            SET (quote_vendor, quote_price, quote_currency, quote_lead_time_weeks) =
+                (new.vendor, new.price, new.currency, new.lead_time_weeks)
+            WHERE selected_quote_id = new.quote_id;
+        END
+    """)
+    
+    # Fill in rows that were created before the columns existed
+    if added_columns:
+        cursor.execute("""
+            UPDATE project_equipment
+            SET (quote_vendor, quote_price, quote_currency, quote_lead_time_weeks) =
+                (SELECT vendor, price, currency, lead_time_weeks
+                 FROM quotes WHERE quote_id = project_equipment.selected_quote_id)
+            WHERE selected_quote_id IS NOT NULL
+        """)
+    
     # INDEXES FOR PERFORMANCE
+    # Filter column first, then the ORDER BY column, so listings read rows
+    # in index order instead of sorting them. project_equipment needs none:
+    # its UNIQUE(project_id, pid_tag) constraint already provides that index.
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_project_equipment 
-        ON project_equipment(project_id)
+        CREATE INDEX IF NOT EXISTS idx_quotes_eq_date 
+        ON quotes(equipment_id, quote_date DESC)
     """)
     
+    # Partial index holding only current quotes, for the current-quote lookups
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_equipment_quotes 
-        ON quotes(equipment_id)
+        CREATE INDEX IF NOT EXISTS idx_quotes_eq_current_date 
+        ON quotes(equipment_id, quote_date DESC) WHERE is_current = 1
     """)
     
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_equipment_docs 
-        ON documents(equipment_id)
+        CREATE INDEX IF NOT EXISTS idx_docs_eq_date 
+        ON documents(equipment_id, uploaded_date DESC)
     """)
     
+    # Superseded by the composite indexes above and the UNIQUE constraint index
+    for index in ('idx_project_equipment', 'idx_equipment_quotes', 'idx_equipment_docs'):
+        cursor.execute(f"DROP INDEX IF EXISTS {index}")
+    
+    # Finds the project equipment to refresh when a quote changes (and backs
+    # the selected_quote_id foreign key check when a quote is deleted)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pe_selected_quote 
+        ON project_equipment(selected_quote_id)
+    """)
+    
+    # Type filter + manufacturer/model sort used by the equipment listings
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_equipment_type 
+        ON equipment_master(equipment_type, manufacturer, model)
+    """)
+    
+    # Without FTS5, search falls back to LIKE, which is case-insensitive and can
+    # only seek on NOCASE indexes (and only for prefix patterns)
+    if not has_fts5:
+        for column in ('manufacturer', 'model', 'equipment_type', 'equipment_subtype'):
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_equipment_{column}_nocase 
+                ON equipment_master({column} COLLATE NOCASE)
+            """)
+    
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
     conn.commit()
     conn.close()
     
@@ -159,12 +367,15 @@ def reset_database():
     cursor = conn.cursor()
     
     # Drop all tables
-    tables = ['documents', 'quotes', 'project_equipment', 'equipment_master', 'projects']
+    tables = ['equipment_fts', 'documents', 'quotes', 'project_equipment', 'equipment_master', 'projects']
     for table in tables:
         cursor.execute(f"DROP TABLE IF EXISTS {table}")
     
     # Drop indexes
-    indexes = ['idx_project_equipment', 'idx_equipment_quotes', 'idx_equipment_docs']
+    indexes = ['idx_quotes_eq_date', 'idx_quotes_eq_current_date', 'idx_docs_eq_date',
+               'idx_pe_selected_quote', 'idx_equipment_type', 'idx_equipment_manufacturer_nocase',
+               'idx_equipment_model_nocase', 'idx_equipment_equipment_type_nocase',
+               'idx_equipment_equipment_subtype_nocase']
     for index in indexes:
         cursor.execute(f"DROP INDEX IF EXISTS {index}")
     